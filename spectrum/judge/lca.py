@@ -1,3 +1,6 @@
+import functools
+
+import numpy as np
 import pandas as pd
 import pyro
 import pyro.distributions as dist
@@ -27,20 +30,18 @@ def lca_model(claims):
         a data frame that has columns [source_id, object_id, value]
 
     """
-    problem_sizes = claims.nunique()
-    n_sources = problem_sizes['source_id']
-    n_objects = problem_sizes['object_id']
-    domain_size = claims.groupby('object_id').max()['value'] + 1
-    # create honest rv, H_s, for each sources
+    n_sources, n_objects, domain_size = _compute_problem_sizes(claims)
+    # create honest rv, H_s, for each sources. The constrained parameters
+    # are kept so that claims reuse them instead of looking them up again
     honest = []
+    theta_s = []
     for s in pyro.plate(name='sources', size=n_sources):
+        theta_s.append(
+            pyro.param(f'theta_s_{s}',
+                       init_tensor=_draw_probs(),
+                       constraint=constraints.simplex))
         honest.append(
-            pyro.sample(
-                f's_{s}',
-                dist.Categorical(
-                    probs=pyro.param(f'theta_s_{s}',
-                                     init_tensor=_draw_probs(),
-                                     constraint=constraints.simplex))))
+            pyro.sample(f's_{s}', dist.Categorical(probs=theta_s[s])))
 
     # creat hidden truth rv for each object m
     hidden_truth = []
@@ -54,21 +55,85 @@ def lca_model(claims):
                                          domain_size[m], )),
                                      constraint=constraints.simplex))))
 
+    # build the observation probs of all claims about an object at once.
+    # Each claim only depends on the hidden truth of its own object, which
+    # keeps the ELBO cost terms of different objects apart
+    source_ids = claims['source_id'].values
+    src_probs = torch.stack(theta_s)[torch.as_tensor(source_ids), 1]
+    claim_probs = [None] * len(claims.index)
+    for m, claim_idx in claims.groupby('object_id').indices.items():
+        probs = _build_obj_probs_from_src_honest(
+            src_probs[torch.as_tensor(claim_idx)], domain_size[m],
+            hidden_truth[m])
+        for c, c_probs in zip(claim_idx, probs):
+            claim_probs[c] = c_probs
+
     for c in pyro.plate(name='claims', size=len(claims.index)):
-        m = claims.iloc[c]['object_id']
-        s = claims.iloc[c]['source_id']
-        y_m = hidden_truth[m]
-        probs = _build_obj_probs_from_src_honest(pyro.param(f'theta_s_{s}'),
-                                                 domain_size[m], y_m)
-        pyro.sample(f'b_{s}_{c}', dist.Categorical(probs=probs))
+        s = source_ids[c]
+        pyro.sample(f'b_{s}_{c}', dist.Categorical(probs=claim_probs[c]))
+
+
+def _compute_problem_sizes(claims):
+    """Compute the number of sources, objects and the domain size of objects.
+
+    Parameters
+    ----------
+    claims: pd.DataFrame
+        a data frame that has columns [source_id, object_id, value]
 
+    Returns
+    -------
+    n_sources: int
 
-def _build_obj_probs_from_src_honest(src_prob, obj_domain_size, truth):
-    src_prob = src_prob[1]
-    obj_probs = torch.ones((obj_domain_size, ))
-    obj_probs *= (1 - src_prob) / (obj_domain_size - 1)
-    obj_probs[truth] = src_prob
-    return obj_probs
+    n_objects: int
+
+    domain_size: np.ndarray
+        a 1D numpy array, domain_size[m] is the domain size of object m
+    """
+    source_ids = claims['source_id'].values
+    object_ids = claims['object_id'].values
+    n_sources = int(source_ids.max()) + 1
+    n_objects = int(object_ids.max()) + 1
+    # values are label encoded, thus the domain size is the max value + 1
+    domain_size = np.zeros(n_objects, dtype=np.int64)
+    np.maximum.at(domain_size, object_ids, claims['value'].values)
+    return n_sources, n_objects, domain_size + 1
+
+
+def _build_obj_probs_from_src_honest(src_probs, obj_domain_size, truth):
+    """Build the observation probs of claims made about the same object.
+
+    Parameters
+    ----------
+    src_probs: torch.Tensor
+        a (n_claims,) tensor of honest probabilities of the claiming sources
+
+    obj_domain_size: int
+        the domain size of the object
+
+    truth: torch.Tensor
+        the hidden truth of the object
+
+    Returns
+    -------
+    obj_probs: torch.Tensor
+        a (n_claims, obj_domain_size) tensor, row i is the distribution of claim i
+    """
+    is_truth = _one_hot(obj_domain_size)[truth]
+    # spread the dishonest mass over the other values, if there are any
+    n_others = max(obj_domain_size - 1, 1)
+    return (src_probs[:, None] * is_truth +
+            (1 - src_probs)[:, None] * (1 - is_truth) / n_others)
+
+
+@functools.lru_cache(maxsize=None)
+def _one_hot(domain_size):
+    """Return a constant (domain_size, domain_size) one-hot table.
+
+    Row v is the one-hot encoding of value v. Tables are cached per domain
+    size so that they are not re-allocated for every claim.
+    """
+    return torch.eye(int(domain_size))
 
 
 def lca_guide(claims):
@@ -83,10 +148,7 @@ def lca_guide(claims):
     claims: pd.DataFrame
         a data frame that has columns [source_id, object_id, value]
     """
-    max_ids = claims.max()
-    n_sources = max_ids['source_id'] + 1
-    n_objects = max_ids['object_id'] + 1
-    domain_size = claims.groupby('object_id').max()['value'] + 1
+    n_sources, n_objects, domain_size = _compute_problem_sizes(claims)
     for s in pyro.plate('sources', size=n_sources):
         # honest source rv
         pyro.sample(
@@ -116,11 +178,14 @@ def make_observation_mapper(claims):
     observation_mapper: dict
         an dictionary that map rv to their observed value
     """
-    observation_mapper = dict()
-    for c in claims.index:
-        s = claims.iloc[c]['source_id']
-        observation_mapper[f'b_{s}_{c}'] = torch.tensor(
-            claims.iloc[c]['value'])
+    # read the columns once instead of materializing a row per claim; c is
+    # the claim position, as in lca_model
+    source_ids = claims['source_id'].values
+    values = claims['value'].values
+    observation_mapper = {
+        f'b_{s}_{c}': torch.tensor(v)
+        for c, (s, v) in enumerate(zip(source_ids, values))
+    }
     return observation_mapper
 
 
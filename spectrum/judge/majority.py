@@ -10,6 +10,10 @@ class MajorityVoting(TruthDiscoverer):
 
     def _majority_vote(self, claims):
         """Perform truth discovery using majority voting
+
+        The value that receives the most votes (claims) wins. Ties are broken
+        by order of appearance: among the values with the most votes, the one
+        claimed first in `claims` wins.
     
         Parameters
         ----------
@@ -21,25 +25,21 @@ class MajorityVoting(TruthDiscoverer):
         discovered_truths: pd.DataFrame
             a data frame that has [object_id, value]
         """
-        c_df = claims[['source_id', 'object_id', 'value']].copy()
-        discovered_truths = c_df.groupby(['object_id'
-                                          ]).apply(lambda x: self.elect(x))
-        discovered_truths = pd.DataFrame(discovered_truths)
-        discovered_truths = discovered_truths.rename(columns={
-            0: 'value'
-        }).reset_index()
-        return discovered_truths
+        # count votes of every (object_id, value) fact in one pass; groups
+        # keep the order of first appearance, which breaks ties
+        votes = claims.groupby(['object_id', 'value'], sort=False).size()
+        object_id = votes.index.get_level_values('object_id').values
+        value = votes.index.get_level_values('value').values
 
-    def elect(self, x):
-        """compute the truth value based on voting; the value received the most votes (by sources) is returned
-        
-        Parameters
-        ----------
-        x: pd.DataFrame
-        
-        Returns
-        -------
-        discovered_truth: pd.DataFrame
-            the discovered truth
-        """
-        return x.value.value_counts().idxmax()
\ No newline at end of file
+        # order facts by object, then by votes descending (stable), so the
+        # elected value is the first fact of each object
+        order = np.lexsort((-votes.values, object_id))
+        object_id = object_id[order]
+        elected = np.ones(len(order), dtype=bool)
+        elected[1:] = object_id[1:] != object_id[:-1]
+
+        discovered_truths = pd.DataFrame(data={
+            'object_id': object_id[elected],
+            'value': value[order][elected]
+        })
+        return discovered_truths
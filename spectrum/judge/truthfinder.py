@@ -3,10 +3,11 @@ import pandas as pd
 from dataclasses import dataclass
 
 from scipy.spatial.distance import cosine
+from scipy.special import expit
 from .truthdiscoverer import TruthDiscoverer
 
 
-def adjust(truth_score):
+def adjust(truth_score, implication=None, rho=0.5):
     """compute adjusted confidence score of facts, sigma(f).
     
     This adjusted scores takes into account of implication of facts about the same objects.
@@ -16,52 +17,56 @@ def adjust(truth_score):
     ----------
     truth_score: pd.Series
         a panda series indexed by (object_id, value) of confidence score
+
+    implication: pd.Series
+        a panda series indexed by (object_id, value) of implication from other facts, see compute_implication.
+        It is aligned with truth_score by index. If None, it is computed from the index of truth_score
+
+    rho: float
+        adjusted parameter
         
     Returns
     -------
     adjusted_truth_score: pd.Series
         a panda series indexed by (object_id, value) of confidence score
     """
-    truth_score_df = pd.DataFrame(data=truth_score, columns=['score'])
-    truth_score_df.reset_index(inplace=True)
+    if implication is None:
+        implication = compute_implication(truth_score.index)
+    return (truth_score + rho * implication).rename('score')
 
-    # adjust
-    truth_score_df = truth_score_df.groupby('object_id').apply(
-        lambda x: _adjust(x))
 
-    return truth_score_df.set_index(['object_id', 'value'])['score']
+def compute_implication(facts):
+    """compute the implication of every fact from the other facts about the same object
 
+    implication(f) = sum_{f' != f}(imp(f'->f)), where f' ranges over facts about the same object as f.
+
+    It only depends on fact values and thus stays the same across TruthFinder iterations.
 
-def _adjust(facts, rho=0.5):
-    """adjust score of facts about the same object
-    
     Parameters
     ----------
-    facts: pd.DataFrame
-        a panda data frame [[object_id, value, score]]
-    
-    rho: float
-        adjusted parameter
-        
+    facts: pd.MultiIndex
+        a panda multi index of unique (object_id, value), e.g. claims.groupby(['object_id', 'value']).size().index
+
     Returns
     -------
-    adjusted_scores: np.ndarray
-        a 1D numpy array of adjusted score
-
+    implication: pd.Series
+        a panda series indexed by (object_id, value) of implication
     """
-    values = facts.values[:, 1].copy()
-    adjusted_scores = facts.values[:, 2].copy()
-    for i in range(len(adjusted_scores)):
-        adjusted_score = adjusted_scores[i]
-        for j in range(len(adjusted_scores)):
-            if j != i:
-                adjusted_score += rho * imp(values[j], values[i])
-
-
-#                 print(f'implication - {imp(values[j], values[i])}')
-        adjusted_scores[i] = adjusted_score
-    facts['score'] = adjusted_scores
-    return facts
+    fact_df = pd.DataFrame({
+        'object_id': facts.get_level_values('object_id'),
+        'value': facts.get_level_values('value'),
+        'fact': np.arange(len(facts))
+    })
+
+    # pair up facts about the same object for all objects at once; a fact
+    # does not imply itself
+    pairs = fact_df.merge(fact_df, on='object_id', suffixes=('_i', '_j'))
+    pairs = pairs[pairs.fact_i != pairs.fact_j]
+    implication = np.bincount(pairs.fact_i.values,
+                              weights=imp(pairs.value_j.values,
+                                          pairs.value_i.values),
+                              minlength=len(facts))
+    return pd.Series(implication, index=facts)
 
 
 def score(x):
@@ -79,7 +84,8 @@ def score(x):
     if np.any((1 - x) == 0.):
         raise ValueError('Probs==1 -> -ln(1-x) is invalid')
 
-    return -np.log(1 - x)
+    # log1p keeps precision for trust values close to 0
+    return -np.log1p(-x)
 
 
 def to_prob(x, dampening_factor):
@@ -98,9 +104,11 @@ def to_prob(x, dampening_factor):
     prob: float
         confidence of fact or source trust worthiness
     """
-    probs = 1 / (1 + np.exp(-x * dampening_factor))
+    # expit does not overflow in exp() for large negative scores
+    probs = expit(x * dampening_factor)
     # Take care of overconfidence. @TODO implement adjusted confidence score
-    probs[np.where(probs == 1.)[0]] = 0.999
+    saturated = (probs == 1.)
+    probs = saturated * 0.999 + (1 - saturated) * probs
     return probs
 
 
@@ -195,24 +203,33 @@ class TruthFinder(TruthDiscoverer):
         truth_df: p.DataFrame
         """
         # compute metadata
-        c_df = claims[['source_id', 'object_id', 'value']].copy()
-        n_sources = c_df.source_id.nunique()
+        n_sources = claims.source_id.nunique()
+        # facts are the sorted (object_id, value) pairs; fact_id is the
+        # position of a claim's fact in that index
+        grouped_facts = claims.groupby(['object_id', 'value'])
+        c_df = pd.DataFrame({
+            'source_id': claims.source_id,
+            'object_id': claims.object_id,
+            'value': claims.value,
+            'fact_id': grouped_facts.ngroup()
+        })
+        implication = compute_implication(grouped_facts.size().index)
 
         # compute trust and truth
         trust = initial_trust * np.ones(n_sources)
         truth = None
         while True:
-            truth = compute_truth(trust, c_df, dampening_factor)
+            truth = compute_truth(trust, c_df, implication,
+                                  dampening_factor)
             trust_next = compute_trust(truth, c_df)
+            similarity = sim_trust(trust, trust_next)
+            trust = trust_next
 
             if verbose:
-                print(f'trust similarity - {sim_trust(trust, trust_next)}')
+                print(f'trust similarity - {similarity}')
 
-            if (sim_trust(trust, trust_next) > similarity_threshold):
-                trust = trust_next
+            if similarity > similarity_threshold:
                 break
-            else:
-                trust = trust_next
 
         truth_df = pd.DataFrame(data=truth)
         truth_df.reset_index(inplace=True)
@@ -222,7 +239,7 @@ class TruthFinder(TruthDiscoverer):
         return truth_df, trust_df
 
 
-def compute_truth(trust, c_df, dampening_factor):
+def compute_truth(trust, c_df, implication, dampening_factor):
     """compute truth (confidence) of fact from source trust score
 
     truth_score(f) = sum_{w in W(f)}(trust_score(w)), where W(f) is the set of all sources provides f.
@@ -235,18 +252,29 @@ def compute_truth(trust, c_df, dampening_factor):
         an array of source trustworthiness
 
     c_df: pd.DataFrame
-        a data frame that has columns [source_id, object_id, value]
+        a data frame that has columns [source_id, object_id, value, fact_id], where fact_id is
+        groupby(['object_id', 'value']).ngroup() computed on the same claims
+
+    implication: pd.Series
+        implication of facts (see compute_implication), indexed by the sorted (object_id, value) facts, i.e.
+        implication[fact_id] is the implication of a claim's fact
+
+    dampening_factor: float
+        see to_prob
 
     Returns
     -------
     truth: pd.Series
         a panda series contains confidences of facts indexed by (object_id, value)
     """
-    trust_score = score(trust)
-    truth_score = c_df.groupby(
-        ['object_id',
-         'value']).apply(lambda x: np.sum(trust_score[x.source_id]))
-    truth_score = adjust(truth_score)
+    trust_score = np.asarray(score(trust))
+    # gather the trust score of every claim's source and scatter-add it
+    # into its fact in one pass
+    truth_score = np.bincount(c_df.fact_id.values,
+                              weights=trust_score[c_df.source_id.values],
+                              minlength=len(implication))
+    truth_score = pd.Series(truth_score, index=implication.index)
+    truth_score = adjust(truth_score, implication)
     truth = to_prob(truth_score, dampening_factor)
     return truth
 
@@ -264,21 +292,16 @@ def compute_trust(truth, c_df):
         a panda series with index (object_id, value)
 
     c_df: pd.DataFrame
-        a data frame that has columns [source_id, object_id, value]
+        a data frame that has columns [source_id, object_id, value, fact_id]
 
     Returns
     -------
     trust: np.array
         an array of source trust worthiness
     """
-    trust = c_df.groupby('source_id').apply(
-        lambda x: _compute_trust(x[['object_id', 'value']].values, truth))
+    # look up the confidence of every claimed fact by position, then
+    # average them per source
+    claim_truth = pd.Series(truth.values[c_df.fact_id.values],
+                            index=c_df.index)
+    trust = claim_truth.groupby(c_df.source_id).mean()
     return trust
-
-
-def _compute_trust(facts, truth):
-    n_fact = facts.shape[0]
-    total_trust = 0.0
-    for f in facts:
-        total_trust += truth[tuple(f)]
-    return total_trust / n_fact
@@ -1,46 +1,76 @@
+import numpy as np
 from sklearn.preprocessing import LabelEncoder
 
 
 def transform(claims):
     """label encode value of claims
-    
+
     Parameters
     ----------
     claims: panda.DataFrame
         a data frame [source_id, object_id, value] where source_id, and object_id is already label encoded.
-    
+
     Returns
     -------
     claims_value_enc: pandas.DataFrame
         a data frame [source_id, object_id, value_id], everything is label encoded.
-        
+
     le_dict: dict
         a dictionary of (object_id -> LabelEncoder)
     """
-    df = claims.copy()
-    group_by_source = df.groupby('object_id')
-    le_dict = group_by_source.apply(lambda x: LabelEncoder().fit(x['value']))
-    for g, index in group_by_source.groups.items():
-        df.loc[index, 'value'] = le_dict[g].transform(df.loc[index, 'value'])
-    return df, le_dict
+    values = claims['value'].values
+    le_dict = dict()
+    encoded = dict()
+    group_by_object = claims.groupby('object_id').indices
+    for g, index in group_by_object.items():
+        le_dict[g] = LabelEncoder()
+        encoded[g] = le_dict[g].fit_transform(values[index])
+    return claims.assign(value=_scatter(encoded, group_by_object)), le_dict
 
 
 def inverse_transform(claims_enc, le_dict):
     """inverse transform value of claims
-    
+
     Parameters
     ----------
     claims_enc: panda.DataFrame
         a data frame [source_id, object_id, value] where value is already label encoded.
-    
+
     Returns
     -------
     claims: pandas.DataFrame
         a data frame [source_id, object_id, value]
     """
-    df = claims_enc.copy()
-    group_by_source = df.groupby('object_id')
-    for g, index in group_by_source.groups.items():
-        df.loc[index, 'value'] = le_dict[g].inverse_transform(
-            df.loc[index, 'value'])
-    return df
\ No newline at end of file
+    values = claims_enc['value'].values
+    decoded = dict()
+    group_by_object = claims_enc.groupby('object_id').indices
+    for g, index in group_by_object.items():
+        decoded[g] = le_dict[g].inverse_transform(values[index])
+    return claims_enc.assign(value=_scatter(decoded, group_by_object))
+
+
+def _scatter(group_values, group_indices):
+    """put per group values back to the positions of their rows
+
+    Parameters
+    ----------
+    group_values: dict
+        a dictionary of (group -> np.ndarray of values)
+
+    group_indices: dict
+        a dictionary of (group -> np.ndarray of row positions), see pd.GroupBy.indices
+
+    Returns
+    -------
+    values: np.ndarray
+        a 1D numpy array of values ordered by row position
+    """
+    groups = list(group_indices)
+    if not groups:
+        # no rows, e.g. an empty claims frame
+        return np.empty(0, dtype=np.int64)
+    index = np.concatenate([group_indices[g] for g in groups])
+    values = np.concatenate([group_values[g] for g in groups])
+    scattered = np.empty_like(values)
+    scattered[index] = values
+    return scattered
@@ -0,0 +1,33 @@
+from spectrum.preprocessing import encoders
+
+import pandas as pd
+
+claims = dict()
+claims['source_id'] = [0, 1, 2, 0, 1]
+claims['object_id'] = [0, 0, 0, 1, 1]
+claims['value'] = ['kenya', 'usa', 'kenya', 'lawyer', 'president']
+claims = pd.DataFrame(data=claims, index=[10, 11, 12, 13, 14])
+
+
+def test_transform():
+    claims_enc, le_dict = encoders.transform(claims)
+    assert claims_enc.index.equals(claims.index)
+    assert claims_enc['value'].tolist() == [0, 1, 0, 0, 1]
+    assert sorted(le_dict.keys()) == [0, 1]
+    assert le_dict[1].inverse_transform([1])[0] == 'president'
+    # the input frame is left untouched
+    assert claims['value'].tolist()[0] == 'kenya'
+
+
+def test_inverse_transform_round_trip():
+    claims_enc, le_dict = encoders.transform(claims)
+    decoded = encoders.inverse_transform(claims_enc, le_dict)
+    pd.testing.assert_frame_equal(decoded, claims)
+
+
+def test_transform_empty_claims():
+    empty = claims.iloc[:0]
+    claims_enc, le_dict = encoders.transform(empty)
+    assert len(claims_enc) == 0
+    assert le_dict == dict()
+    assert len(encoders.inverse_transform(claims_enc, le_dict)) == 0
@@ -1,6 +1,10 @@
-from spectrum.judge.lca import make_observation_mapper
+from spectrum.judge.lca import lca_model, make_observation_mapper
 
 import pandas as pd
+import pyro
+from pyro import poutine
+from pyro.infer.tracegraph_elbo import TrackNonReparam
+from pyro.ops.provenance import get_provenance
 
 claims = dict()
 claims['source_id'] = [0, 0, 1]
@@ -14,6 +18,30 @@ def test_make_observation():
     assert len(mapper.keys()) == len(claims)
 
 
+def test_make_observation_uses_claim_position():
+    mapper = make_observation_mapper(claims.set_index(claims.index + 10))
+    assert sorted(mapper.keys()) == ['b_0_0', 'b_0_1', 'b_1_2']
+    assert int(mapper['b_0_1']) == 1
+
+
+def test_claims_only_depend_on_their_object_truth():
+    trace_claims = pd.DataFrame(data={
+        'source_id': [0, 1, 0, 1, 2],
+        'object_id': [0, 0, 1, 1, 2],
+        'value': [0, 1, 1, 0, 2]
+    })
+    pyro.clear_param_store()
+    conditioned_lca = pyro.condition(
+        lca_model, data=make_observation_mapper(trace_claims))
+    with TrackNonReparam():
+        trace = poutine.trace(conditioned_lca).get_trace(trace_claims)
+    trace.compute_log_prob()
+    for c, (s, m) in enumerate(
+            zip(trace_claims['source_id'], trace_claims['object_id'])):
+        site = trace.nodes[f'b_{s}_{c}']
+        assert get_provenance(site['log_prob']) == {f'y_{m}'}
+
+
 # def test_build_mask():
 #     W = build_mask(claims)
 #     assert W.shape == (2, 2)
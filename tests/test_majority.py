@@ -0,0 +1,24 @@
+from spectrum.judge.majority import MajorityVoting
+
+import pandas as pd
+
+
+def test_majority_vote():
+    claims = dict()
+    claims['source_id'] = [0, 1, 2, 0, 1]
+    claims['object_id'] = [0, 0, 0, 1, 1]
+    claims['value'] = [5, 7, 7, 3, 3]
+    truths, _ = MajorityVoting().discover(pd.DataFrame(data=claims))
+    assert truths['object_id'].tolist() == [0, 1]
+    assert truths['value'].tolist() == [7, 3]
+
+
+def test_majority_vote_breaks_ties_by_first_appearance():
+    # 0 and 2 both get three votes, 2 is claimed first
+    values = [3, 3, 1, 2, 1, 0, 0, 2, 0, 2]
+    claims = dict()
+    claims['source_id'] = list(range(len(values)))
+    claims['object_id'] = [0] * len(values)
+    claims['value'] = values
+    truths, _ = MajorityVoting().discover(pd.DataFrame(data=claims))
+    assert truths['value'].tolist() == [2]
@@ -0,0 +1,84 @@
+from spectrum.judge import truthfinder
+from spectrum.judge.truthfinder import (TruthFinder, TruthFinderAuxiliaryData,
+                                        adjust, compute_implication,
+                                        to_prob)
+
+import numpy as np
+import pandas as pd
+
+
+facts = pd.MultiIndex.from_tuples([(0, 1), (0, 3), (1, 0), (1, 1), (1, 2)],
+                                  names=['object_id', 'value'])
+
+
+def test_compute_implication():
+    implication = compute_implication(facts)
+    assert implication.index.equals(facts)
+    # imp(f1->f2) = tanh(|f1 - f2|), only facts about the same object count
+    expected = [
+        np.tanh(2),
+        np.tanh(2),
+        np.tanh(1) + np.tanh(2),
+        np.tanh(1) + np.tanh(1),
+        np.tanh(2) + np.tanh(1)
+    ]
+    assert np.allclose(implication.values, expected)
+
+
+def test_compute_implication_skips_self_pairs(monkeypatch):
+    # with imp == 1 a fact gets one unit per other fact about its object
+    monkeypatch.setattr(truthfinder, 'imp', lambda f1, f2: np.ones(len(f1)))
+    single = pd.MultiIndex.from_tuples([(2, 7)], names=['object_id', 'value'])
+    implication = compute_implication(facts.append(single))
+    assert implication.values.tolist() == [1., 1., 2., 2., 2., 0.]
+
+
+def test_adjust_computes_implication_by_default():
+    truth_score = pd.Series([1., 2., 3., 4., 5.], index=facts)
+    expected = truth_score.values + 0.5 * compute_implication(facts).values
+    adjusted = adjust(truth_score)
+    assert adjusted.index.equals(facts)
+    assert np.allclose(adjusted.values, expected)
+
+
+def test_adjust_aligns_implication_by_index():
+    truth_score = pd.Series([1., 2., 3., 4., 5.], index=facts)
+    implication = compute_implication(facts)
+    adjusted = adjust(truth_score, implication[::-1])
+    assert np.allclose(adjusted.values, adjust(truth_score, implication).values)
+
+
+def test_to_prob_clamps_saturated_scores():
+    index = pd.MultiIndex.from_tuples([(0, 0), (0, 1), (1, 0)],
+                                      names=['object_id', 'value'])
+    scores = pd.Series([0., 1000., -1000.], index=index, name='score')
+    probs = to_prob(scores, dampening_factor=0.3)
+    assert probs.index.equals(index)
+    assert probs[(0, 0)] == 0.5
+    assert probs[(0, 1)] == 0.999
+    assert probs[(1, 0)] < 1e-10
+
+
+def test_truthfinder_discover():
+    claims = dict()
+    claims['source_id'] = [0, 1, 2, 0, 1, 2, 2]
+    claims['object_id'] = [0, 0, 0, 1, 1, 1, 2]
+    claims['value'] = [1, 1, 2, 0, 0, 3, 4]
+    auxiliary_data = TruthFinderAuxiliaryData()
+    auxiliary_data.verbose = False
+    truth, trust = TruthFinder().discover(pd.DataFrame(data=claims),
+                                          auxiliary_data)
+
+    assert truth.columns.tolist() == ['object_id', 'value', 'confidence']
+    assert truth[['object_id', 'value']].values.tolist() == [[0, 1], [0, 2],
+                                                             [1, 0], [1, 3],
+                                                             [2, 4]]
+    assert truth.confidence.between(0, 1).all()
+    # the values backed by the two agreeing sources are more confident
+    confidence = truth.set_index(['object_id', 'value']).confidence
+    assert confidence[(0, 1)] > confidence[(0, 2)]
+    assert confidence[(1, 0)] > confidence[(1, 3)]
+
+    assert trust.columns.tolist() == ['source_id', 'trust_worthiness']
+    assert trust.source_id.tolist() == [0, 1, 2]
+    assert np.isclose(trust.trust_worthiness[0], trust.trust_worthiness[1])